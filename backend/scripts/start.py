@@ -8,10 +8,17 @@ import os
 import sys
 import argparse
 import subprocess
+from importlib.util import find_spec
 from pathlib import Path
 
-# Add src directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+# Packages that must be importable for the API server to run
+REQUIRED_PACKAGES = ("fastapi", "transformers", "torch", "sqlalchemy")
+
+def add_src_to_path():
+    """Add the src directory to sys.path so backend modules can be imported."""
+    src_dir = str(Path(__file__).parent.parent / 'src')
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
 
 def print_banner():
     """Print the chatbot banner."""
@@ -26,17 +33,28 @@ def check_dependencies():
     """Check if required dependencies are installed."""
     print("🔍 Checking dependencies...")
     
-    try:
-        import fastapi
-        import transformers
-        import torch
-        import sqlalchemy
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    # find_spec only locates the packages, it does not import them, so
+    # torch/transformers are never initialized just to check presence
+    missing = [pkg for pkg in REQUIRED_PACKAGES if find_spec(pkg) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    
+    print("✅ All required packages are installed")
+    return True
+
+def parse_env_file(env_file: Path) -> dict:
+    """Parse KEY=VALUE lines from a .env file in a single pass."""
+    env = {}
+    for line in env_file.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        # Drop inline comments such as "MODEL_SIZE=small  # Options: ..."
+        env[key.strip()] = value.split(' #', 1)[0].strip()
+    return env
 
 def check_environment():
     """Check environment configuration."""
@@ -47,20 +65,9 @@ def check_environment():
         print("✅ .env file found")
         
         # Read and display key configs
-        with open(env_file, 'r') as f:
-            content = f.read()
-            
-        if 'DB_TYPE=' in content:
-            db_type = [line for line in content.split('\n') if line.startswith('DB_TYPE=')][0]
-            print(f"  Database: {db_type.split('=')[1]}")
-        else:
-            print("  Database: Not configured (general chat mode)")
-            
-        if 'MODEL_SIZE=' in content:
-            model_size = [line for line in content.split('\n') if line.startswith('MODEL_SIZE=')][0]
-            print(f"  Model Size: {model_size.split('=')[1]}")
-        else:
-            print("  Model Size: small (default)")
+        env = parse_env_file(env_file)
+        print(f"  Database: {env.get('DB_TYPE') or 'Not configured (general chat mode)'}")
+        print(f"  Model Size: {env.get('MODEL_SIZE') or 'small (default)'}")
     else:
         print("⚠️  No .env file found")
         print("  Copy env.example to .env and configure your settings")
@@ -77,16 +84,15 @@ def start_api_server(host="0.0.0.0", port=8000, debug=False):
     print()
     
     try:
-        # Set environment variables
-        env = os.environ.copy()
-        if debug:
-            env['DEBUG'] = 'True'
+        # Only build a new environment when there is something to override;
+        # env=None lets the server inherit ours as-is
+        env = {**os.environ, 'DEBUG': 'True'} if debug else None
         
-        # Start the server
-        main_path = Path(__file__).parent.parent / 'src' / 'main.py'
+        # Start the server as a package module so its relative imports resolve
+        project_root = Path(__file__).parent.parent.parent
         subprocess.run([
-            sys.executable, str(main_path)
-        ], env=env, check=True)
+            sys.executable, '-m', 'backend.src.main'
+        ], env=env, cwd=str(project_root), check=True)
         
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
@@ -116,6 +122,7 @@ def show_status():
     
     try:
         # Import and check components
+        add_src_to_path()
         from config import AppConfig, ModelConfig
         from db import db_manager
         from nlp import nlp_engine
@@ -124,7 +131,7 @@ def show_status():
         print(f"Model Loaded: {'✅' if nlp_engine.model else '❌'}")
         print(f"Database Connected: {'✅' if db_manager.is_connected else '❌'}")
         if db_manager.is_connected:
-            print(f"Database Type: {db_manager.engine.dialect.name}")
+            print(f"Database Type: {db_manager.dialect_name}")
         print(f"API Host: {AppConfig.HOST}:{AppConfig.PORT}")
         print(f"Debug Mode: {'✅' if AppConfig.DEBUG else '❌'}")
         
@@ -3,6 +3,7 @@ Configuration file for the chatbot system.
 Contains database connection settings and model configurations.
 """
 import os
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -29,9 +30,19 @@ class DatabaseConfig:
     POSTGRES_PASSWORD = os.getenv('POSTGRES_PASSWORD', '')
     POSTGRES_DATABASE = os.getenv('POSTGRES_DATABASE', 'chatbot_db')
     
+    # Connection Pool Configuration
+    POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_OVERFLOW', 20))
+    POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    
+    # Create the example tables on every startup (otherwise run: python -m backend.src.db --create-tables)
+    AUTO_CREATE_TABLES = os.getenv('DB_AUTO_CREATE_TABLES', 'False').lower() == 'true'
+    
     @classmethod
+    @lru_cache(maxsize=1)
     def get_connection_string(cls) -> Optional[str]:
-        """Get database connection string based on configuration."""
+        """Get database connection string based on configuration (computed once)."""
         if cls.DB_TYPE == 'mysql':
             return f"mysql+pymysql://{cls.MYSQL_USER}:{cls.MYSQL_PASSWORD}@{cls.MYSQL_HOST}:{cls.MYSQL_PORT}/{cls.MYSQL_DATABASE}"
         elif cls.DB_TYPE == 'postgresql':
@@ -44,7 +55,23 @@ class ModelConfig:
     # Model selection: 'small', 'medium', 'large'
     MODEL_SIZE = os.getenv('MODEL_SIZE', 'small')
     
-    # Model configurations for different sizes
+    # Dynamically quantize the chat model's linear layers to int8 when running on CPU
+    QUANTIZE = os.getenv('MODEL_QUANTIZE', 'True').lower() == 'true'
+    
+    # Same for the intent sentence transformer. Off by default: int8 shifts the
+    # cosine similarities that INTENT_THRESHOLD and SEMANTIC_CACHE_THRESHOLD
+    # were tuned against, so re-check both when enabling it
+    SENTENCE_MODEL_QUANTIZE = os.getenv('SENTENCE_MODEL_QUANTIZE', 'False').lower() == 'true'
+    
+    # Intent recognition sentence transformer: 'torch' or 'onnx' (ONNX Runtime,
+    # needs optimum[onnxruntime]); the file picks one of the model's prebuilt
+    # graph-optimized exports
+    SENTENCE_MODEL_BACKEND = os.getenv('SENTENCE_MODEL_BACKEND', 'torch')
+    SENTENCE_MODEL_ONNX_FILE = os.getenv('SENTENCE_MODEL_ONNX_FILE', 'onnx/model_O3.onnx')
+    SENTENCE_MODEL_ONNX_PROVIDER = os.getenv('SENTENCE_MODEL_ONNX_PROVIDER', 'CPUExecutionProvider')
+    
+    # Model configurations for different sizes. max_length caps prompt plus reply
+    # tokens; longer prompts are truncated from the start (oldest context first)
     MODELS = {
         'small': {
             'name': 'microsoft/DialoGPT-small',
@@ -64,8 +91,9 @@ class ModelConfig:
     }
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_model_config(cls):
-        """Get current model configuration."""
+        """Get current model configuration (computed once)."""
         return cls.MODELS.get(cls.MODEL_SIZE, cls.MODELS['small'])
 
 class AppConfig:
@@ -76,10 +104,44 @@ class AppConfig:
     PORT = int(os.getenv('PORT', 8000))
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     
+    # Browser origins allowed to call the API (the bundled UI runs on localhost)
+    CORS_ORIGIN_REGEX = os.getenv('CORS_ORIGIN_REGEX', r'https?://(localhost|127\.0\.0\.1)(:\d+)?')
+    
+    # Also allow the "null" origin, which browsers send for pages opened from
+    # file:// but also for sandboxed iframes on any site, so it is opt-in
+    CORS_ALLOW_NULL_ORIGIN = os.getenv('CORS_ALLOW_NULL_ORIGIN', 'False').lower() == 'true'
+    
+    # Server worker processes (ignored in debug/reload mode). Session memory,
+    # chat history and the response cache are per process, so keep this at 1
+    # unless requests from the same user are pinned to one worker.
+    WORKERS = int(os.getenv('WORKERS', 1))
+    
     # Chat Configuration
     MAX_HISTORY_LENGTH = int(os.getenv('MAX_HISTORY_LENGTH', 10))
     RESPONSE_TIMEOUT = int(os.getenv('RESPONSE_TIMEOUT', 30))
     
+    # Intents answered from the organization's database when one is connected
+    DATABASE_INTENTS = frozenset({'revenue_query', 'customer_query', 'product_query'})
+    
+    # Number of recognized intents cached by normalized message
+    INTENT_CACHE_SIZE = int(os.getenv('INTENT_CACHE_SIZE', 1024))
+    
+    # Number of responses kept in the exact-match response cache (0 disables it)
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 4096))
+    
+    # Responses kept for near-duplicate message lookup by embedding (0 disables it),
+    # and the cosine similarity a new message needs to reuse one of them
+    SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', 256))
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.92))
+    
+    # LLM micro-batching: prompts from concurrent chat requests that arrive within
+    # the window are generated together, up to this many per batch
+    GENERATION_BATCH_SIZE = int(os.getenv('GENERATION_BATCH_SIZE', 8))
+    GENERATION_BATCH_WINDOW_MS = int(os.getenv('GENERATION_BATCH_WINDOW_MS', 20))
+    
+    # Seconds to cache the table list served by /database/info
+    DB_INFO_CACHE_TTL = int(os.getenv('DB_INFO_CACHE_TTL', 60))
+    
     # Intent Recognition
     INTENT_THRESHOLD = float(os.getenv('INTENT_THRESHOLD', 0.7))
     
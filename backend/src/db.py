@@ -2,14 +2,13 @@
 Database connection and query helper functions.
 Handles both MySQL and PostgreSQL connections via SQLAlchemy.
 """
+import calendar
 import logging
-from typing import Optional, Dict, List, Any
-from sqlalchemy import create_engine, text, MetaData, Table, Column, String, Integer, Float, DateTime
+from typing import Optional, Dict, List, Any, Iterator, Mapping, Tuple
+from sqlalchemy import create_engine, text, Column, String, Integer, Float, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
-import pandas as pd
 
 try:
     from .config import DatabaseConfig
@@ -27,8 +26,9 @@ class DatabaseManager:
     
     def __init__(self):
         self.engine = None
-        self.Session = None
         self.is_connected = False
+        self.dialect_name: Optional[str] = None
+        self.connection_info: Dict[str, Any] = {}
         self._initialize_connection()
     
     def _initialize_connection(self):
@@ -40,8 +40,28 @@ class DatabaseManager:
             return
         
         try:
-            self.engine = create_engine(connection_string, echo=False)
-            self.Session = sessionmaker(bind=self.engine)
+            # LIFO reuse keeps the most recently used (warm) connection busy and
+            # lets idle overflow connections age out; pre-ping drops dead sockets
+            self.engine = create_engine(
+                connection_string,
+                echo=False,
+                pool_size=DatabaseConfig.POOL_SIZE,
+                max_overflow=DatabaseConfig.POOL_MAX_OVERFLOW,
+                pool_timeout=DatabaseConfig.POOL_TIMEOUT,
+                pool_recycle=DatabaseConfig.POOL_RECYCLE,
+                pool_pre_ping=True,
+                pool_use_lifo=True
+            )
+            
+            # Cache engine details reported by the status/info endpoints
+            self.dialect_name = self.engine.dialect.name
+            self.connection_info = {
+                "type": self.dialect_name,
+                "host": self.engine.url.host,
+                "port": self.engine.url.port,
+                "database": self.engine.url.database,
+                "username": self.engine.url.username
+            }
             
             # Test connection
             with self.engine.connect() as conn:
@@ -50,22 +70,25 @@ class DatabaseManager:
             self.is_connected = True
             logger.info(f"Successfully connected to {DatabaseConfig.DB_TYPE} database")
             
-            # Create tables if they don't exist
-            self._create_tables()
+            # Schema setup costs DDL round-trips, so it only runs on startup when enabled
+            if DatabaseConfig.AUTO_CREATE_TABLES:
+                self._create_tables()
             
         except SQLAlchemyError as e:
             logger.error(f"Failed to connect to database: {e}")
             self.is_connected = False
     
-    def _create_tables(self):
+    def _create_tables(self) -> bool:
         """Create necessary tables if they don't exist."""
         try:
             Base.metadata.create_all(self.engine)
             logger.info("Database tables created/verified successfully")
+            return True
         except SQLAlchemyError as e:
             logger.error(f"Failed to create tables: {e}")
+            return False
     
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> Optional[List[Dict]]:
+    def execute_query(self, query: str, params: Optional[Dict] = None) -> Optional[List[Mapping[str, Any]]]:
         """
         Execute a SQL query and return results.
         
@@ -74,29 +97,61 @@ class DatabaseManager:
             params: Optional parameters for the query
             
         Returns:
-            List of dictionaries containing query results, or None if failed
+            List of dict-like row mappings containing query results, or None if failed
         """
         if not self.is_connected:
             logger.warning("Database not connected. Cannot execute query.")
             return None
         
         try:
-            with self.Session() as session:
-                result = session.execute(text(query), params or {})
-                
-                if result.returns_rows:
-                    # Convert to list of dictionaries
-                    columns = result.keys()
-                    rows = [dict(zip(columns, row)) for row in result.fetchall()]
-                    return rows
-                else:
-                    session.commit()
+            # A plain connection is enough for raw SQL; the ORM Session's identity
+            # map and flush tracking would be pure overhead here
+            with self.engine.connect() as conn:
+                with conn.begin():
+                    result = conn.execute(text(query), params or {})
+                    
+                    if result.returns_rows:
+                        return result.mappings().all()
                     return []
                     
         except SQLAlchemyError as e:
             logger.error(f"Query execution failed: {e}")
             return None
     
+    def stream_query(self, query: str, params: Optional[Dict] = None, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SQL query and yield rows one at a time.
+        
+        Rows are fetched through a server-side cursor in batches of
+        ``chunk_size``, so memory stays bounded for large result sets.
+        
+        Args:
+            query: SQL query string
+            params: Optional parameters for the query
+            chunk_size: Number of rows fetched from the server per batch
+            
+        Yields:
+            One dictionary per result row
+            
+        Raises:
+            SQLAlchemyError: If the query fails, including part-way through the
+                result set, so a truncated stream is never mistaken for a complete one
+        """
+        if not self.is_connected:
+            logger.warning("Database not connected. Cannot execute query.")
+            return
+        
+        try:
+            with self.engine.connect() as conn:
+                conn = conn.execution_options(stream_results=True, yield_per=chunk_size)
+                with conn.begin():
+                    for row in conn.execute(text(query), params or {}).mappings():
+                        yield dict(row)
+                        
+        except SQLAlchemyError as e:
+            logger.error(f"Streaming query failed: {e}")
+            raise
+    
     def get_revenue_data(self, period: str = "last_quarter") -> Optional[Dict]:
         """
         Get revenue data for the specified period.
@@ -110,41 +165,26 @@ class DatabaseManager:
         if not self.is_connected:
             return None
         
-        # Example revenue query - customize based on your database schema
-        if period == "last_quarter":
-            query = """
-                SELECT 
-                    SUM(amount) as total_revenue,
-                    COUNT(*) as transaction_count,
-                    AVG(amount) as average_transaction
-                FROM transactions 
-                WHERE created_at >= DATE_SUB(NOW(), INTERVAL 3 MONTH)
-                AND created_at < NOW()
-            """
-        elif period == "last_year":
-            query = """
-                SELECT 
-                    SUM(amount) as total_revenue,
-                    COUNT(*) as transaction_count,
-                    AVG(amount) as average_transaction
-                FROM transactions 
-                WHERE YEAR(created_at) = YEAR(NOW()) - 1
-            """
-        elif period == "current_month":
-            query = """
-                SELECT 
-                    SUM(amount) as total_revenue,
-                    COUNT(*) as transaction_count,
-                    AVG(amount) as average_transaction
-                FROM transactions 
-                WHERE MONTH(created_at) = MONTH(NOW())
-                AND YEAR(created_at) = YEAR(NOW())
-            """
-        else:
+        bounds = self._revenue_period_bounds(period)
+        if bounds is None:
             return None
         
+        # Example revenue query - customize based on your database schema.
+        # The period bounds are bound parameters, so every period shares one
+        # statement (and one cached plan) on both MySQL and PostgreSQL.
+        query = """
+            SELECT 
+                SUM(amount) as total_revenue,
+                COUNT(*) as transaction_count,
+                AVG(amount) as average_transaction
+            FROM transactions 
+            WHERE created_at >= :start
+            AND created_at < :end
+        """
+        params = {"start": bounds[0], "end": bounds[1]}
+        
         try:
-            results = self.execute_query(query)
+            results = self.execute_query(query, params)
             if results and len(results) > 0:
                 return results[0]
         except Exception as e:
@@ -152,6 +192,36 @@ class DatabaseManager:
         
         return None
     
+    @staticmethod
+    def _revenue_period_bounds(period: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Compute the [start, end) timestamps for a revenue period.
+        
+        Timestamps are UTC to match the ``created_at`` column default.
+        
+        Args:
+            period: Time period ('last_quarter', 'last_year', 'current_month')
+            
+        Returns:
+            Tuple of (start, end) datetimes, or None for an unknown period
+        """
+        now = datetime.utcnow()
+        
+        if period == "last_quarter":
+            # Same day three months back, clamped to the end of shorter months
+            year, month = (now.year, now.month - 3) if now.month > 3 else (now.year - 1, now.month + 9)
+            day = min(now.day, calendar.monthrange(year, month)[1])
+            return now.replace(year=year, month=month, day=day), now
+        elif period == "last_year":
+            return datetime(now.year - 1, 1, 1), datetime(now.year, 1, 1)
+        elif period == "current_month":
+            start = datetime(now.year, now.month, 1)
+            if now.month == 12:
+                return start, datetime(now.year + 1, 1, 1)
+            return start, datetime(now.year, now.month + 1, 1)
+        
+        return None
+    
     def get_customer_data(self, customer_id: Optional[str] = None) -> Optional[List[Dict]]:
         """
         Get customer data from the database.
@@ -209,11 +279,14 @@ class Transaction(Base):
     __tablename__ = 'transactions'
     
     id = Column(Integer, primary_key=True)
-    customer_id = Column(String(50))
-    product_id = Column(String(50))
+    customer_id = Column(String(50), index=True)
+    product_id = Column(String(50), index=True)
     amount = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+# Covering index for revenue queries: filter on created_at, aggregate amount
+Index('ix_tx_created_amount', Transaction.created_at, Transaction.amount)
+
 class Customer(Base):
     """Example customer table."""
     __tablename__ = 'customers'
@@ -235,3 +308,25 @@ class Product(Base):
 
 # Global database manager instance
 db_manager = DatabaseManager()
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    
+    parser = argparse.ArgumentParser(description="Yara database utilities")
+    parser.add_argument(
+        '--create-tables',
+        action='store_true',
+        help="Create the example tables if they don't exist"
+    )
+    args = parser.parse_args()
+    
+    if not args.create_tables:
+        parser.print_help()
+        sys.exit(0)
+    
+    if not db_manager.is_connected:
+        print("❌ No database connected. Check DB_TYPE and the connection settings in .env")
+        sys.exit(1)
+    
+    sys.exit(0 if db_manager._create_tables() else 1)
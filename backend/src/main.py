@@ -2,35 +2,25 @@
 Main entry point for the chatbot API.
 Sets up FastAPI application and registers all routes.
 """
+import asyncio
 import logging
-import uvicorn
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
 
-try:
-    # Try relative imports first (when run as module)
-    from .config import AppConfig, ModelConfig, DatabaseConfig
-    from .routes import (
-        chat_endpoint_func,
-        status_endpoint_func,
-        health_endpoint_func,
-        clear_history_endpoint_func,
-        database_info_endpoint_func
-    )
-    from .routes import ChatRequest, ChatResponse, SystemStatus, HealthCheck
-except ImportError:
-    # Fallback to absolute imports (when run directly)
-    from config import AppConfig, ModelConfig, DatabaseConfig
-    from routes import (
-        chat_endpoint_func,
-        status_endpoint_func,
-        health_endpoint_func,
-        clear_history_endpoint_func,
-        database_info_endpoint_func
-    )
-    from routes import ChatRequest, ChatResponse, SystemStatus, HealthCheck
+from .config import AppConfig, ModelConfig, DatabaseConfig
+from .routes import (
+    chat_endpoint_func,
+    status_endpoint_func,
+    health_endpoint_func,
+    clear_history_endpoint_func,
+    database_info_endpoint_func,
+    warm_up_models_func
+)
+from .routes import ChatRequest, ChatResponse, SystemStatus, HealthCheck
 
 # Configure logging
 logging.basicConfig(
@@ -47,9 +37,15 @@ async def lifespan(main: FastAPI):
     logger.info("🚀 Starting Yara - Your Friendly AI Assistant...")
     logger.info("✨ Yara is ready to help with conversations and insights!")
     logger.info(
-        f"Configuration: Model size={ModelConfig.MODEL_SIZE}, Database={DatabaseConfig.DB_TYPE or 'None'}"
+        "Configuration: Model size=%s, Database=%s",
+        ModelConfig.MODEL_SIZE, DatabaseConfig.DB_TYPE or 'None'
     )
     
+    # Load models in the background so the server accepts health checks right away;
+    # /chat waits on this event before generating a response
+    main.state.nlp_ready = asyncio.Event()
+    main.state.warm_up_task = asyncio.create_task(warm_up_models_func(main.state.nlp_ready))
+    
     yield
     
     # Shutdown
@@ -63,31 +59,56 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware. The "null" origin (index.html opened straight from disk)
+# is opt-in; the UI doesn't use cookies, so no credentials.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=["null"] if AppConfig.CORS_ALLOW_NULL_ORIGIN else [],
+    allow_origin_regex=AppConfig.CORS_ORIGIN_REGEX,
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
 )
 
+# Compress larger responses (long replies, table listings); small ones aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error": str(exc)}
     )
 
+# The root payload never changes, so serialize it once at import
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": "Hello! I'm Yara, your friendly AI assistant! 🤖✨",
+    "version": "1.0.0",
+    "description": "I'm here to help you with conversations, answer questions, and provide insights from your organization's data. I'm friendly, helpful, and always ready to assist!",
+    "personality": {
+        "name": "Yara",
+        "traits": ["Friendly", "Helpful", "Intelligent", "Patient", "Enthusiastic"],
+        "greeting": "Hi there! I'm Yara, and I'm excited to help you today! 😊"
+    },
+    "endpoints": {
+        "chat": "/chat - Chat with Yara",
+        "status": "/status - System status",
+        "health": "/health - Health check",
+        "database": "/database/info - Database information",
+        "docs": "/docs - API documentation"
+    },
+    "quick_start": "Send a message to /chat to start chatting with me!"
+})
+
 # API Routes
 @app.post("/chat", response_model=ChatResponse, tags=["Chat"])
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """
     Chat with Yara, your friendly AI assistant!
     
@@ -97,17 +118,21 @@ async def chat(request: ChatRequest):
     
     Yara will respond with helpful, friendly assistance and insights.
     """
-    return await chat_endpoint_func(request)
+    response = await chat_endpoint_func(request, getattr(http_request.app.state, "nlp_ready", None))
+    
+    # The model is already validated, so serialize it directly with pydantic-core
+    # instead of letting FastAPI re-validate it against response_model
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 @app.get("/status", response_model=SystemStatus, tags=["System"])
-async def get_status():
+async def get_status(http_request: Request):
     """
     Get system status and health information.
     
     Returns current system status including database connection,
     model loading status, and uptime information.
     """
-    return await status_endpoint_func()
+    return await status_endpoint_func(getattr(http_request.app.state, "nlp_ready", None))
 
 @app.get("/health", response_model=HealthCheck, tags=["System"])
 async def health_check():
@@ -116,7 +141,10 @@ async def health_check():
     
     Returns basic health status and API version information.
     """
-    return await health_endpoint_func()
+    health = await health_endpoint_func()
+    
+    # Already a validated model; skip FastAPI's response_model round-trip like /chat
+    return Response(content=health.model_dump_json(), media_type="application/json")
 
 @app.delete("/chat/history", tags=["Chat"])
 async def clear_history(session_id: str = None):
@@ -130,14 +158,14 @@ async def clear_history(session_id: str = None):
     return await clear_history_endpoint_func(session_id)
 
 @app.get("/database/info", tags=["Database"])
-async def get_database_info():
+async def get_database_info(http_request: Request):
     """
     Get database connection information and available tables.
     
     Returns database connection status, type, and available tables
     if a database is configured and connected.
     """
-    return await database_info_endpoint_func()
+    return await database_info_endpoint_func(getattr(http_request.app.state, "nlp_ready", None))
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -146,33 +174,23 @@ async def root():
     
     Returns basic information about Yara, your friendly AI assistant.
     """
-    return {
-        "message": "Hello! I'm Yara, your friendly AI assistant! 🤖✨",
-        "version": "1.0.0",
-        "description": "I'm here to help you with conversations, answer questions, and provide insights from your organization's data. I'm friendly, helpful, and always ready to assist!",
-        "personality": {
-            "name": "Yara",
-            "traits": ["Friendly", "Helpful", "Intelligent", "Patient", "Enthusiastic"],
-            "greeting": "Hi there! I'm Yara, and I'm excited to help you today! 😊"
-        },
-        "endpoints": {
-            "chat": "/chat - Chat with Yara",
-            "status": "/status - System status",
-            "health": "/health - Health check",
-            "database": "/database/info - Database information",
-            "docs": "/docs - API documentation"
-        },
-        "quick_start": "Send a message to /chat to start chatting with me!"
-    }
+    return Response(
+        content=_ROOT_PAYLOAD,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
 
 if __name__ == "__main__":
+    import uvicorn
+    
     logger.info("🚀 Starting Yara - Your Friendly AI Assistant...")
     
-    # Run the server
+    # Run the server (reload and multiple workers both need the app as an import string)
     uvicorn.run(
-        app,
+        "backend.src.main:app",
         host=AppConfig.HOST,
         port=AppConfig.PORT,
         reload=AppConfig.DEBUG,
+        workers=None if AppConfig.DEBUG else AppConfig.WORKERS,
         log_level="info"
     )
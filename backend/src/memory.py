@@ -4,18 +4,37 @@ Handles storing and retrieving user information during chat sessions.
 """
 import logging
 import re
-from typing import Dict, Optional, List, Tuple
+import string
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, List, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+class MemoryMeta(NamedTuple):
+    """Metadata about when and how a memory entry was stored."""
+    timestamp: datetime
+    source: str
+    session_age: float
+
 class SessionMemory:
     """Manages session-based memory for user information."""
     
-    def __init__(self):
+    __slots__ = (
+        "memory", "memory_metadata", "session_start", "_session_monotonic_start",
+        "_memory_view", "_summary_cache", "_track_metadata"
+    )
+    
+    def __init__(self, track_metadata: bool = False):
+        # Metadata is opt-in since nothing in the chat path reads it
+        self._track_metadata = track_metadata
         self.memory: Dict[str, any] = {}
-        self.memory_metadata: Dict[str, Dict] = {}  # Track when/how info was stored
+        self.memory_metadata: Dict[str, MemoryMeta] = {}  # Track when/how info was stored
         self.session_start = datetime.now()
+        self._session_monotonic_start = time.monotonic()  # Used for cheap session_age math
+        self._memory_view = MappingProxyType(self.memory)  # Read-only live view for get_all()
+        self._summary_cache: Optional[str] = None  # Invalidated on every write
         
     def store(self, key: str, value: str, source: str = "user_input") -> None:
         """
@@ -27,12 +46,14 @@ class SessionMemory:
             source: How the information was obtained ('user_input', 'extracted', etc.)
         """
         self.memory[key] = value
-        self.memory_metadata[key] = {
-            'timestamp': datetime.now(),
-            'source': source,
-            'session_age': (datetime.now() - self.session_start).total_seconds()
-        }
-        logger.info(f"Stored in memory: {key} = {value}")
+        self._summary_cache = None
+        if self._track_metadata:
+            self.memory_metadata[key] = MemoryMeta(
+                timestamp=datetime.now(),
+                source=source,
+                session_age=time.monotonic() - self._session_monotonic_start
+            )
+        logger.info("Stored in memory: %s = %s", key, value)
     
     def retrieve(self, key: str) -> Optional[str]:
         """
@@ -62,8 +83,9 @@ class SessionMemory:
         """
         if key in self.memory:
             del self.memory[key]
-            del self.memory_metadata[key]
-            logger.info(f"Removed from memory: {key}")
+            self.memory_metadata.pop(key, None)
+            self._summary_cache = None
+            logger.info("Removed from memory: %s", key)
             return True
         return False
     
@@ -71,27 +93,55 @@ class SessionMemory:
         """Clear all session memory."""
         self.memory.clear()
         self.memory_metadata.clear()
+        self._summary_cache = None
         self.session_start = datetime.now()
+        self._session_monotonic_start = time.monotonic()
         logger.info("Session memory cleared")
     
-    def get_all(self) -> Dict[str, any]:
-        """Get all stored memory as a dictionary."""
-        return self.memory.copy()
+    def get_all(self) -> Mapping[str, any]:
+        """Get all stored memory as a read-only mapping (copy it before mutating)."""
+        return self._memory_view
     
     def get_memory_summary(self) -> str:
         """Get a human-readable summary of stored memory."""
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
         if not self.memory:
-            return "I don't have any information stored yet."
+            self._summary_cache = "I don't have any information stored yet."
+            return self._summary_cache
         
         summary_parts = []
         for key, value in self.memory.items():
             summary_parts.append(f"• {key}: {value}")
         
-        return "Here's what I remember:\n" + "\n".join(summary_parts)
+        self._summary_cache = "Here's what I remember:\n" + "\n".join(summary_parts)
+        return self._summary_cache
 
 class MemoryManager:
     """High-level memory management with natural language understanding."""
     
+    # Every memory pattern contains at least one of these as a standalone word,
+    # so messages without any of them can skip the regex scan entirely
+    _TRIGGER_WORDS = frozenset({
+        'my', 'i', "i'm", 'me', 'you', 'remember', 'know', 'call',
+        'forget', 'remove', 'delete', 'clear'
+    })
+    
+    # Punctuation (except apostrophes, which appear in "i'm") is treated as whitespace
+    _PUNCTUATION_TABLE = str.maketrans({c: ' ' for c in string.punctuation if c != "'"})
+    
+    # Words users say in forget requests, mapped to the memory key they refer to
+    _FORGET_ALIASES = {
+        'name': 'name',
+        'color': 'favorite_color',
+        'colour': 'favorite_color',
+        'clr': 'favorite_color',
+        'location': 'location',
+        'home': 'location',
+        'city': 'location'
+    }
+    
     def __init__(self):
         self.session_memory = SessionMemory()
         
@@ -153,6 +203,41 @@ class MemoryManager:
                 r'my information\??'
             ]
         }
+        
+        # Fuse every pattern into one regex so a message is scanned by a single
+        # C-level match instead of one re.search per pattern.
+        self._combined_pattern, self._alternatives = self._build_combined_pattern()
+    
+    def _build_combined_pattern(self) -> Tuple[re.Pattern, Dict[str, Tuple[str, Optional[int]]]]:
+        """
+        Build a single regex covering all memory patterns.
+        
+        Each pattern becomes a named alternative prefixed with a lazy ``.*?``
+        anchored at the start of the input, so alternatives are tried strictly
+        in priority order (forget, summary, store, query) just like the
+        original sequential checks, rather than by leftmost match position.
+        
+        Returns:
+            Tuple of (compiled regex, mapping of alternative name to
+            (pattern_type, index of the captured value group or None))
+        """
+        pattern_types = ['forget_request', 'memory_summary']
+        pattern_types += [t for t in self.memory_patterns if t.startswith('store_')]
+        pattern_types += [t for t in self.memory_patterns if t.startswith('query_')]
+        
+        alternatives = {}
+        parts = []
+        group_index = 0
+        for pattern_type in pattern_types:
+            for i, pattern in enumerate(self.memory_patterns[pattern_type]):
+                name = f"{pattern_type}__{i}"
+                group_index += 1
+                value_groups = re.compile(pattern).groups
+                alternatives[name] = (pattern_type, group_index + 1 if value_groups else None)
+                group_index += value_groups
+                parts.append(f"(?P<{name}>(?s:.*?){pattern})")
+        
+        return re.compile("^(?:" + "|".join(parts) + ")"), alternatives
     
     def process_input(self, user_input: str) -> Tuple[Optional[str], str]:
         """
@@ -167,81 +252,80 @@ class MemoryManager:
         """
         user_input_lower = user_input.lower()
         
-        # Check for forget patterns FIRST (highest priority)
-        for pattern in self.memory_patterns['forget_request']:
-            match = re.search(pattern, user_input_lower)
-            if match:
-                if 'what i told you' in user_input_lower:
-                    self.session_memory.clear()
-                    return "Alright, I'll forget everything you told me for now. 🧹", 'forget'
-                else:
-                    extracted_key = match.group(1)
-                    # Try to find the actual key in memory
-                    actual_key = None
-                    for key in self.session_memory.memory.keys():
-                        if extracted_key in key or key in extracted_key:
-                            actual_key = key
-                            break
-                    
-                    if actual_key:
-                        self.session_memory.remove(actual_key)
-                        return f"Alright, I'll forget your {actual_key} for now. 🧹", 'forget'
-                    else:
-                        return f"I don't have your {extracted_key} stored, so there's nothing to forget. 🤷‍♀️", 'forget'
+        # Cheap fast path for ordinary chat messages
+        tokens = user_input_lower.translate(self._PUNCTUATION_TABLE).split()
+        if self._TRIGGER_WORDS.isdisjoint(tokens):
+            return None, 'none'
+        
+        match = self._combined_pattern.search(user_input_lower)
+        if not match:
+            # No memory operation detected
+            return None, 'none'
         
-        # Check for memory summary (high priority)
-        for pattern in self.memory_patterns['memory_summary']:
-            if re.search(pattern, user_input_lower):
-                return self.session_memory.get_memory_summary(), 'summary'
+        pattern_type, value_group = self._alternatives[match.lastgroup]
+        value = match.group(value_group) if value_group else None
         
-        # Check for store patterns
-        for pattern_type, patterns in self.memory_patterns.items():
-            if pattern_type.startswith('store_'):
-                for pattern in patterns:
-                    match = re.search(pattern, user_input_lower)
-                    if match:
-                        key = pattern_type.replace('store_', '')
-                        value = match.group(1).strip()
-                        self.session_memory.store(key, value)
-                        
-                        if key == 'name':
-                            return f"Nice to meet you, {value}! I'll remember that during this chat. 😊", 'store'
-                        elif key == 'favorite_color':
-                            return f"Got it! I'll remember that your favorite color is {value}. 🎨", 'store'
-                        elif key == 'location':
-                            return f"Thanks! I'll remember you're from {value}. 🌍", 'store'
-                        else:
-                            return f"I'll remember that your {key} is {value}. 👍", 'store'
+        # Forget requests take priority over everything else
+        if pattern_type == 'forget_request':
+            if 'what i told you' in user_input_lower:
+                self.session_memory.clear()
+                return "Alright, I'll forget everything you told me for now. 🧹", 'forget'
+            
+            extracted_key = value
+            memory = self.session_memory.memory
+            actual_key = self._FORGET_ALIASES.get(extracted_key, extracted_key)
+            if actual_key not in memory:
+                # Fall back to partial matches such as "favorite" -> "favorite_color"
+                actual_key = next(
+                    (key for key in memory if extracted_key in key or key in extracted_key),
+                    None
+                )
+            
+            if actual_key:
+                self.session_memory.remove(actual_key)
+                return f"Alright, I'll forget your {actual_key} for now. 🧹", 'forget'
+            else:
+                return f"I don't have your {extracted_key} stored, so there's nothing to forget. 🤷‍♀️", 'forget'
+        
+        if pattern_type == 'memory_summary':
+            return self.session_memory.get_memory_summary(), 'summary'
+        
+        if pattern_type.startswith('store_'):
+            key = pattern_type.replace('store_', '')
+            value = value.strip()
+            self.session_memory.store(key, value)
+            
+            if key == 'name':
+                return f"Nice to meet you, {value}! I'll remember that during this chat. 😊", 'store'
+            elif key == 'favorite_color':
+                return f"Got it! I'll remember that your favorite color is {value}. 🎨", 'store'
+            elif key == 'location':
+                return f"Thanks! I'll remember you're from {value}. 🌍", 'store'
+            else:
+                return f"I'll remember that your {key} is {value}. 👍", 'store'
         
-        # Check for query patterns LAST (lowest priority)
-        for pattern_type, patterns in self.memory_patterns.items():
-            if pattern_type.startswith('query_'):
-                for pattern in patterns:
-                    if re.search(pattern, user_input_lower):
-                        key = pattern_type.replace('query_', '')
-                        stored_value = self.session_memory.retrieve(key)
-                        
-                        if stored_value:
-                            if key == 'name':
-                                return f"Your name is {stored_value}. 😊", 'query'
-                            elif key == 'favorite_color':
-                                return f"Your favorite color is {stored_value}. 🎨", 'query'
-                            elif key == 'location':
-                                return f"You're from {stored_value}. 🌍", 'query'
-                            else:
-                                return f"Your {key} is {stored_value}. 👍", 'query'
-                        else:
-                            if key == 'name':
-                                return "I don't know yet! What's your name? 😊", 'query'
-                            elif key == 'favorite_color':
-                                return "I don't know yet! What's your favorite color? 🎨", 'query'
-                            elif key == 'location':
-                                return "I don't know yet! Where are you from? 🌍", 'query'
-                            else:
-                                return f"I don't know your {key} yet. Could you tell me? 🤔", 'query'
+        # Otherwise this is a query pattern
+        key = pattern_type.replace('query_', '')
+        stored_value = self.session_memory.retrieve(key)
         
-        # No memory operation detected
-        return None, 'none'
+        if stored_value:
+            if key == 'name':
+                return f"Your name is {stored_value}. 😊", 'query'
+            elif key == 'favorite_color':
+                return f"Your favorite color is {stored_value}. 🎨", 'query'
+            elif key == 'location':
+                return f"You're from {stored_value}. 🌍", 'query'
+            else:
+                return f"Your {key} is {stored_value}. 👍", 'query'
+        else:
+            if key == 'name':
+                return "I don't know yet! What's your name? 😊", 'query'
+            elif key == 'favorite_color':
+                return "I don't know yet! What's your favorite color? 🎨", 'query'
+            elif key == 'location':
+                return "I don't know yet! Where are you from? 🌍", 'query'
+            else:
+                return f"I don't know your {key} yet. Could you tell me? 🤔", 'query'
     
     def get_context_for_nlp(self) -> str:
         """
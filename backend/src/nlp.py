@@ -3,13 +3,20 @@ NLP/LLM processing module for the chatbot.
 Handles model loading, intent recognition, and response generation.
 """
 import logging
+import queue
 import re
-from typing import Dict, List, Optional, Tuple
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers.pytorch_utils import Conv1D
 import torch
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 try:
     from .config import ModelConfig, AppConfig
@@ -24,6 +31,98 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Phrases that mark a generated response as inappropriate or nonsensical,
+# matched as substrings in a single pass
+_INAPPROPRIATE_PHRASES_RE = re.compile('|'.join(map(re.escape, [
+    'waifu', 'hero that\'s needed', 'who is this', 'tell me about your',
+    'i am the', 'i am a', 'i am', 'i\'m the', 'i\'m a'
+])))
+
+# A response to "who are you" must mention at least one of these
+_PERSONAL_KEYWORDS_RE = re.compile('|'.join(map(re.escape, [
+    'yara', 'assistant', 'ai', 'help', 'friendly', 'helpful'
+])))
+
+# Where the model starts writing the next dialogue turn after Yara's reply
+_NEXT_TURN_RE = re.compile(r'\b(?:User|Yara|Assistant):')
+
+# Canned responses used when generation is skipped, fails or is rejected
+_FALLBACK_RESPONSES = {
+    'revenue_query': "I'm sorry, I couldn't retrieve the revenue information at the moment. Please try again later or contact our support team.",
+    'customer_query': "I'm unable to access customer data right now. Please check back later or reach out to our team for assistance.",
+    'product_query': "I'm having trouble accessing product information. Please try again later or contact our support team.",
+    'greeting': "Hi there! I'm Yara, and I'm so excited to meet you! 😊 How can I help you today?",
+    'personal_question': "I'm Yara, your friendly AI assistant! I'm here to help with conversations, answer questions, and provide insights from your data. I love being helpful and making our chats enjoyable! ✨",
+    'gratitude': "You're very welcome! I'm so glad I could help! 😊 It makes me happy when I can be useful to you.",
+    'farewell': "Goodbye! It was wonderful chatting with you! Take care and come back anytime - I'll be here ready to help! 👋✨",
+    'memory_query': "I'm not sure I understood that question. Could you rephrase it or ask me something else? 🤔",
+    'memory_store': "I'm not sure I understood that. Could you rephrase it or ask me something else? 🤔",
+    'memory_manage': "I'm not sure I understood that request. Could you rephrase it or ask me something else? 🤔",
+    'general_chat': "I'm not sure I understood that, could you rephrase? 🤔"
+}
+
+# Intent-specific fallbacks keyed by a phrase in the user's message, checked in order
+_ENHANCED_FALLBACKS = {
+    'personal_question': (
+        ('who are you', "I'm Yara, your friendly AI assistant! I'm here to help with conversations, answer questions, and provide insights from your data. I love being helpful and making our chats enjoyable! ✨"),
+        ('what\'s your name', "My name is Yara! I'm your friendly AI assistant, and I'm excited to help you with whatever you need! 😊"),
+        ('tell me about yourself', "I'm Yara, a friendly and enthusiastic AI assistant! I love helping people, answering questions, and making conversations enjoyable. I'm here to assist you with both general chat and data insights! ✨"),
+        ('what can you do', "I can help you with conversations, answer questions, provide insights from your data, and be a friendly chat companion! I'm Yara, and I'm excited to assist you! 😊")
+    )
+}
+
+def _quantize_for_cpu(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Apply int8 dynamic quantization to a causal LM for CPU inference.
+    
+    GPT-2 style models (DialoGPT) implement their attention and MLP projections
+    with transformers' Conv1D rather than nn.Linear, so those layers are first
+    swapped for equivalent nn.Linear modules to make them quantizable.
+    
+    Args:
+        model: Model loaded in float32
+        
+    Returns:
+        Quantized model
+    """
+    def replace_conv1d(module: torch.nn.Module) -> None:
+        for name, child in module.named_children():
+            if isinstance(child, Conv1D):
+                # Conv1D stores its weight as (in_features, out_features)
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(module, name, linear)
+            else:
+                replace_conv1d(child)
+    
+    replace_conv1d(model)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _select_dtype() -> torch.dtype:
+    """
+    Pick the weight dtype for the generator model on the available hardware.
+    
+    Returns:
+        float16 on GPU; bfloat16 on CPUs with native bf16 support (unless the
+        model is going to be int8-quantized, which needs float32 weights);
+        float32 otherwise
+    """
+    if torch.cuda.is_available():
+        return torch.float16
+    if ModelConfig.QUANTIZE:
+        return torch.float32
+    bf16_supported = getattr(torch.cpu, '_is_avx512_bf16_supported', lambda: False)
+    return torch.bfloat16 if bf16_supported() else torch.float32
+
+class _UncacheableRecognition(Exception):
+    """Carries a degraded recognition result out of the intent LRU cache uncached."""
+    
+    def __init__(self, result: Tuple[str, float, Optional[np.ndarray]]):
+        super().__init__()
+        self.result = result
+
 class IntentRecognizer:
     """Recognizes user intent from input text."""
     
@@ -98,13 +197,165 @@ class IntentRecognizer:
             ]
         }
         
+        # Example sentences per intent for semantic similarity scoring
+        self.intent_examples = {
+            'revenue_query': [
+                'What was our revenue last quarter?',
+                'How much money did we make?',
+                'What are our earnings?'
+            ],
+            'customer_query': [
+                'How many customers do we have?',
+                'Show me customer information',
+                'List our clients'
+            ],
+            'product_query': [
+                'What products do we offer?',
+                'Show me our inventory',
+                'What are our prices?'
+            ],
+            'greeting': [
+                'Hello, how are you?',
+                'Hi there!',
+                'Good morning!',
+                'Hey, what\'s up?'
+            ],
+            'personal_question': [
+                'Who are you?',
+                'What\'s your name?',
+                'Tell me about yourself',
+                'What can you do?'
+            ],
+            'gratitude': [
+                'Thank you!',
+                'Thanks a lot',
+                'I appreciate it',
+                'Great job!'
+            ],
+            'farewell': [
+                'Goodbye!',
+                'See you later',
+                'Take care',
+                'Have a good day!'
+            ],
+            'memory_query': [
+                'What is my name?',
+                'What\'s my favorite color?',
+                'Where do I live?',
+                'Do you know my name?'
+            ],
+            'memory_store': [
+                'My name is Alex',
+                'I like blue',
+                'I live in New York',
+                'Call me John'
+            ],
+            'memory_manage': [
+                'Forget my name',
+                'What do you remember?',
+                'Clear my information'
+            ],
+            'general_chat': [
+                'Tell me a joke',
+                'What\'s the weather like?',
+                'How\'s it going?',
+                'What\'s new?'
+            ]
+        }
+        
+        # Whole messages that unambiguously map to an intent answered by a canned
+        # fallback; these skip pattern scoring and the sentence transformer
+        self.fast_path_phrases = {
+            **dict.fromkeys([
+                'hello', 'hi', 'hey', 'hello there', 'hi there', 'hey there',
+                'hello yara', 'hi yara', 'hey yara', 'good morning', 'good afternoon', 'good evening'
+            ], 'greeting'),
+            **dict.fromkeys([
+                'thanks', 'thank you', 'thx', 'thanks a lot', 'thank you so much',
+                'thanks yara', 'thank you yara'
+            ], 'gratitude'),
+            **dict.fromkeys([
+                'bye', 'goodbye', 'bye bye', 'see you', 'see ya', 'see you later',
+                'good night', 'take care', 'bye yara', 'goodbye yara'
+            ], 'farewell'),
+            **dict.fromkeys([
+                'who are you', "what's your name", 'what is your name',
+                'what can you do', 'tell me about yourself'
+            ], 'personal_question')
+        }
+        
+        # Compile every pattern once instead of going through re's cache per call
+        self._compiled_patterns = {
+            intent: [re.compile(pattern) for pattern in patterns]
+            for intent, patterns in self.intent_patterns.items()
+        }
+        
+        # The sentence model's fast tokenizer isn't thread-safe ("Already borrowed"),
+        # so every encode runs under this lock
+        self._encode_lock = threading.Lock()
+        
         # Load sentence transformer for semantic similarity
         try:
-            self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.sentence_model = self._load_sentence_model('all-MiniLM-L6-v2')
             logger.info("Sentence transformer model loaded successfully")
         except Exception as e:
             logger.warning(f"Failed to load sentence transformer: {e}")
             self.sentence_model = None
+        
+        # The examples never change, so embed them once instead of on every call.
+        # They are stacked into one matrix; each intent owns a contiguous row range.
+        # Both are read-only after __init__, so the arrays themselves can be shared
+        # across threads; encoding new text still goes through _encode_lock.
+        self._example_embeddings: Optional[np.ndarray] = None
+        self._intent_slices: Dict[str, Tuple[int, int]] = {}
+        if self.sentence_model:
+            all_examples = []
+            for intent, examples in self.intent_examples.items():
+                self._intent_slices[intent] = (len(all_examples), len(all_examples) + len(examples))
+                all_examples.extend(examples)
+            try:
+                self._example_embeddings = self._encode(all_examples)
+            except Exception as e:
+                logger.warning(f"Failed to embed intent examples: {e}")
+        
+        # Repeated messages ("hello", "thanks") skip recognition entirely; the
+        # sentence model is uncased, so lowercasing doesn't change the result
+        self._recognize_cached = lru_cache(maxsize=AppConfig.INTENT_CACHE_SIZE)(self._recognize_single)
+    
+    def _load_sentence_model(self, model_name: str) -> SentenceTransformer:
+        """
+        Load the sentence transformer with the configured backend.
+        
+        The ONNX Runtime backend runs a graph-optimized export (fused attention,
+        LayerNorm and GELU) that is faster than eager PyTorch for short inputs.
+        If it can't be loaded, the PyTorch backend is used instead, quantized to
+        int8 on CPU when SENTENCE_MODEL_QUANTIZE is enabled.
+        
+        Args:
+            model_name: Sentence transformer model name
+            
+        Returns:
+            Loaded SentenceTransformer
+        """
+        if ModelConfig.SENTENCE_MODEL_BACKEND == 'onnx':
+            try:
+                return SentenceTransformer(
+                    model_name,
+                    backend='onnx',
+                    model_kwargs={
+                        'file_name': ModelConfig.SENTENCE_MODEL_ONNX_FILE,
+                        'provider': ModelConfig.SENTENCE_MODEL_ONNX_PROVIDER
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"ONNX sentence transformer unavailable, falling back to PyTorch: {e}")
+        
+        model = SentenceTransformer(model_name)
+        if ModelConfig.SENTENCE_MODEL_QUANTIZE and not torch.cuda.is_available():
+            # Examples and queries are both embedded by the quantized model, but
+            # int8 still shifts absolute cosine values against INTENT_THRESHOLD
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        return model
     
     def recognize_intent(self, text: str) -> Tuple[str, float]:
         """
@@ -116,124 +367,230 @@ class IntentRecognizer:
         Returns:
             Tuple of (intent, confidence_score)
         """
-        text_lower = text.lower()
+        intent, confidence, _ = self.recognize_intent_with_embedding(text)
+        return intent, confidence
+    
+    def recognize_intent_with_embedding(self, text: str) -> Tuple[str, float, Optional[np.ndarray]]:
+        """
+        Recognize the intent of user input, also returning its sentence embedding.
         
-        # Pattern-based intent recognition
-        pattern_scores = {}
-        for intent, patterns in self.intent_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text_lower))
-                score += matches * 0.3  # Weight for pattern matching
+        Args:
+            text: User input text
             
-            if score > 0:
-                pattern_scores[intent] = score
+        Returns:
+            Tuple of (intent, confidence_score, embedding); embedding is the
+            L2-normalized embedding used for scoring, or None if the message
+            was never encoded (fast-path phrases, or no sentence transformer).
+            The array is shared with the cache and must not be modified.
+        """
+        try:
+            return self._recognize_cached(text.lower())
+        except _UncacheableRecognition as e:
+            # Semantic scoring failed this time; serve the pattern-only result
+            # without pinning it in the cache
+            return e.result
+    
+    def _recognize_single(self, text_lower: str) -> Tuple[str, float, Optional[np.ndarray]]:
+        """
+        Uncached recognition of one lowercased message.
+        
+        Raises:
+            _UncacheableRecognition: If the message should have been encoded but
+                encoding failed, so lru_cache doesn't store the degraded result
+        """
+        result = self._recognize_batch([text_lower])[0]
+        semantic_available = self.sentence_model is not None and self._example_embeddings is not None
+        if result[2] is None and semantic_available and self._fast_path_intent(text_lower) is None:
+            raise _UncacheableRecognition(result)
+        return result
+    
+    def recognize_intents_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Recognize the intent of several inputs at once.
+        
+        All inputs are embedded in a single sentence transformer call, and each
+        intent's precomputed example embeddings are scored against the whole
+        batch together.
+        
+        Args:
+            texts: User input texts
+            
+        Returns:
+            List of (intent, confidence_score) tuples, one per input text
+        """
+        return [(intent, confidence) for intent, confidence, _ in self._recognize_batch(texts)]
+    
+    def _recognize_batch(self, texts: List[str]) -> List[Tuple[str, float, Optional[np.ndarray]]]:
+        """Body of recognize_intents_batch, keeping each text's embedding (or None)."""
+        # Simple greetings, thanks, etc. are answered without any scoring
+        results: List[Optional[Tuple[str, float, Optional[np.ndarray]]]] = []
+        for text in texts:
+            fast_path = self._fast_path_intent(text)
+            results.append(fast_path + (None,) if fast_path else None)
+        pending = [i for i, result in enumerate(results) if result is None]
+        embeddings: Dict[int, np.ndarray] = {}
+        
+        # Pattern-based intent recognition
+        batch_scores = {i: self._pattern_scores(texts[i]) for i in pending}
         
         # Semantic similarity for better intent recognition
-        if self.sentence_model:
+        if self.sentence_model and self._example_embeddings is not None and pending:
             try:
-                # Define intent examples
-                intent_examples = {
-                    'revenue_query': [
-                        'What was our revenue last quarter?',
-                        'How much money did we make?',
-                        'What are our earnings?'
-                    ],
-                    'customer_query': [
-                        'How many customers do we have?',
-                        'Show me customer information',
-                        'List our clients'
-                    ],
-                    'product_query': [
-                        'What products do we offer?',
-                        'Show me our inventory',
-                        'What are our prices?'
-                    ],
-                    'greeting': [
-                        'Hello, how are you?',
-                        'Hi there!',
-                        'Good morning!',
-                        'Hey, what\'s up?'
-                    ],
-                    'personal_question': [
-                        'Who are you?',
-                        'What\'s your name?',
-                        'Tell me about yourself',
-                        'What can you do?'
-                    ],
-                    'gratitude': [
-                        'Thank you!',
-                        'Thanks a lot',
-                        'I appreciate it',
-                        'Great job!'
-                    ],
-                    'farewell': [
-                        'Goodbye!',
-                        'See you later',
-                        'Take care',
-                        'Have a good day!'
-                    ],
-                    'memory_query': [
-                        'What is my name?',
-                        'What\'s my favorite color?',
-                        'Where do I live?',
-                        'Do you know my name?'
-                    ],
-                    'memory_store': [
-                        'My name is Alex',
-                        'I like blue',
-                        'I live in New York',
-                        'Call me John'
-                    ],
-                    'memory_manage': [
-                        'Forget my name',
-                        'What do you remember?',
-                        'Clear my information'
-                    ],
-                    'general_chat': [
-                        'Tell me a joke',
-                        'What\'s the weather like?',
-                        'How\'s it going?',
-                        'What\'s new?'
-                    ]
-                }
-                
-                # Calculate semantic similarity
-                text_embedding = self.sentence_model.encode([text])
+                # Calculate semantic similarity against every example at once; the
+                # embeddings are unit length, so one matmul gives the cosine similarities
+                text_embeddings = self._encode([texts[i] for i in pending])
+                embeddings = dict(zip(pending, text_embeddings))
+                similarities = text_embeddings @ self._example_embeddings.T
                 
-                for intent, examples in intent_examples.items():
-                    example_embeddings = self.sentence_model.encode(examples)
-                    similarities = cosine_similarity(text_embedding, example_embeddings)[0]
-                    semantic_score = np.max(similarities) * 0.7  # Weight for semantic similarity
+                for intent, (start, end) in self._intent_slices.items():
+                    semantic_scores = similarities[:, start:end].max(axis=1) * 0.7  # Weight for semantic similarity
                     
-                    if intent in pattern_scores:
-                        pattern_scores[intent] += semantic_score
-                    else:
-                        pattern_scores[intent] = semantic_score
+                    for i, semantic_score in zip(pending, semantic_scores):
+                        pattern_scores = batch_scores[i]
+                        if intent in pattern_scores:
+                            pattern_scores[intent] += semantic_score
+                        else:
+                            pattern_scores[intent] = semantic_score
                         
             except Exception as e:
                 logger.warning(f"Semantic similarity failed: {e}")
         
-        # Determine best intent
+        for i in pending:
+            results[i] = self._best_intent(batch_scores[i]) + (embeddings.get(i),)
+        return results
+    
+    def _fast_path_intent(self, text: str) -> Optional[Tuple[str, float]]:
+        """Return (intent, 1.0) if the whole message is a known fast-path phrase, else None."""
+        intent = self.fast_path_phrases.get(text.lower().strip(" \t\n!.?,"))
+        return (intent, 1.0) if intent else None
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts to L2-normalized embeddings without autograd tracking."""
+        with self._encode_lock, torch.inference_mode():
+            return self.sentence_model.encode(texts, normalize_embeddings=True)
+    
+    def _pattern_scores(self, text: str) -> Dict[str, float]:
+        """Score each intent by how many of its patterns match the text."""
+        text_lower = text.lower()
+        
+        pattern_scores = {}
+        for intent, patterns in self._compiled_patterns.items():
+            score = 0
+            for pattern in patterns:
+                matches = len(pattern.findall(text_lower))
+                score += matches * 0.3  # Weight for pattern matching
+            
+            if score > 0:
+                pattern_scores[intent] = score
+        
+        return pattern_scores
+    
+    def _best_intent(self, pattern_scores: Dict[str, float]) -> Tuple[str, float]:
+        """Pick the highest scoring intent, defaulting to general chat below the threshold."""
         if pattern_scores:
-            best_intent = max(pattern_scores.items(), key=lambda x: x[1])
-            confidence = min(best_intent[1], 1.0)  # Cap confidence at 1.0
+            # Single pass; ties keep the first intent, as max() did
+            best_intent, best_score = None, float('-inf')
+            for intent, score in pattern_scores.items():
+                if score > best_score:
+                    best_intent, best_score = intent, score
+            confidence = 1.0 if best_score > 1.0 else best_score  # Cap confidence at 1.0
             
             if confidence >= AppConfig.INTENT_THRESHOLD:
-                return best_intent[0], confidence
+                return best_intent, confidence
         
         # Default to general chat if no clear intent
         return 'general_chat', 0.5
 
+class GenerationBatcher:
+    """
+    Coalesces concurrent text generation requests into batched model calls.
+    
+    Callers block in submit() while a single worker thread collects prompts
+    for up to ``window`` seconds (or until ``max_batch_size`` are queued) and
+    runs them through the model together, so one pass over the weights serves
+    every waiting request.
+    """
+    
+    def __init__(self, generate_batch: Callable[[List[str]], List[str]],
+                 max_batch_size: int, window: float):
+        self._generate_batch = generate_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = max(0.0, window)
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+    
+    def submit(self, prompt: str) -> str:
+        """
+        Generate text for a prompt as part of the next batch.
+        
+        Args:
+            prompt: Full model input
+            
+        Returns:
+            Text generated after the prompt (the prompt itself is not included)
+        """
+        future: Future = Future()
+        self._queue.put((prompt, future))
+        self._ensure_worker()
+        return future.result()
+    
+    def _ensure_worker(self) -> None:
+        """Start the worker thread on first use."""
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="yara-generation", daemon=True)
+                self._worker.start()
+    
+    def _run(self) -> None:
+        """Collect and run batches forever."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = self._generate_batch(prompts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+
 class ChatbotNLP:
     """Main NLP processing class for the chatbot."""
     
     def __init__(self):
         self.tokenizer = None
         self.model = None
-        self.generator = None
+        self._generation_kwargs: Dict[str, object] = {}
+        self._max_prompt_tokens: Optional[int] = None
         self.intent_recognizer = IntentRecognizer()
-        self.chat_history = []
+        self.chat_history: "deque[Dict[str, Optional[str]]]" = deque(maxlen=AppConfig.MAX_HISTORY_LENGTH)  # Oldest exchange drops off automatically
+        self._context_cache: Optional[str] = None  # Invalidated whenever the history changes
+        self._response_cache: "OrderedDict[Tuple[str, str, str], Tuple[str, str, float]]" = OrderedDict()
+        self.response_cache_hits = 0
+        self.response_cache_misses = 0
+        self._semantic_cache: "OrderedDict[Tuple[str, str, str], Tuple[np.ndarray, str, str]]" = OrderedDict()
+        self.semantic_cache_hits = 0
+        # Guards the response caches, chat history and session memory. It is held
+        # only while that state is read or updated, never across encoding,
+        # database queries or generation, so concurrent requests still overlap.
+        self._lock = threading.Lock()
+        self._batcher = GenerationBatcher(
+            self._generate_batch,
+            AppConfig.GENERATION_BATCH_SIZE,
+            AppConfig.GENERATION_BATCH_WINDOW_MS / 1000
+        )
         self._load_model()
     
     def _load_model(self):
@@ -248,31 +605,49 @@ class ChatbotNLP:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             self.model = AutoModelForCausalLM.from_pretrained(
                 model_name,
-                torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
+                torch_dtype=_select_dtype(),
                 device_map="auto" if torch.cuda.is_available() else None
             )
             
+            # Inference only: disable dropout and other training-mode behaviour
+            self.model.eval()
+            
+            # int8 weights roughly halve memory traffic for CPU generation
+            if ModelConfig.QUANTIZE and not torch.cuda.is_available():
+                self.model = _quantize_for_cpu(self.model)
+                logger.info(f"Model {model_name} quantized to int8")
+            
             # Set pad token if not present
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
             
-            # Create text generation pipeline
-            self.generator = pipeline(
-                "text-generation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                max_length=model_config['max_length'],
-                temperature=model_config['temperature'],
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id
+            # Decoder-only models must be left-padded for batched generation
+            self.tokenizer.padding_side = "left"
+            
+            # Over-long prompts lose their oldest context rather than the "User: ... Yara:" cue
+            self.tokenizer.truncation_side = "left"
+            
+            # Sampling settings passed straight to model.generate
+            self._generation_kwargs = {
+                'max_new_tokens': 50,
+                'temperature': model_config['temperature'],
+                'do_sample': True,
+                'pad_token_id': self.tokenizer.eos_token_id,
+                'use_cache': True
+            }
+            
+            # Prompt plus reply must fit the configured max_length (and the model's context window)
+            max_length = min(
+                model_config['max_length'],
+                getattr(self.model.config, 'max_position_embeddings', model_config['max_length'])
             )
+            self._max_prompt_tokens = max_length - self._generation_kwargs['max_new_tokens']
             
             logger.info(f"Model {model_name} loaded successfully")
             
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             self.model = None
-            self.generator = None
     
     def generate_response(self, user_input: str, context: Optional[str] = None) -> str:
         """
@@ -285,22 +660,92 @@ class ChatbotNLP:
         Returns:
             Generated response string
         """
-        # First, check if this is a memory-related operation
-        memory_response, memory_action = memory_manager.process_input(user_input)
-        if memory_response:
-            logger.info(f"Memory operation detected: {memory_action}")
-            return memory_response
-        
-        # Recognize intent
-        intent, confidence = self.intent_recognizer.recognize_intent(user_input)
+        return self._respond(user_input, context)[0]
+    
+    def process(self, user_input: str, context: Optional[str] = None) -> Tuple[str, str, float]:
+        """
+        Generate a response and report the recognized intent in a single pass.
+        
+        Intent recognition runs once per message and its result is shared by
+        response generation and the caller, instead of being recomputed.
+        
+        Args:
+            user_input: User's message
+            context: Optional context information
+            
+        Returns:
+            Tuple of (response, intent, confidence_score)
+        """
+        response, intent, confidence = self._respond(user_input, context)
+        if intent is None:
+            # Memory operations are answered before intent recognition runs
+            intent, confidence = self.intent_recognizer.recognize_intent(user_input)
+        return response, intent, confidence
+    
+    def _respond(self, user_input: str, context: Optional[str] = None) -> Tuple[str, Optional[str], float]:
+        """
+        Generate a response, returning the intent it was based on.
+        
+        Args:
+            user_input: User's message
+            context: Optional context information
+            
+        Returns:
+            Tuple of (response, intent, confidence_score); intent is None when
+            the message was handled by the memory manager
+        """
+        with self._lock:
+            # First, check if this is a memory-related operation
+            memory_response, memory_action = memory_manager.process_input(user_input)
+            if memory_response:
+                logger.info(f"Memory operation detected: {memory_action}")
+                return memory_response, None, 0.0
+            
+            # Repeated messages in the same conversation state are answered from the cache
+            cache_key = self._response_cache_key(user_input, context)
+            cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Recognize intent; the message embedding is reused by the semantic cache
+        intent, confidence, embedding = self.intent_recognizer.recognize_intent_with_embedding(user_input)
         logger.info(f"Recognized intent: {intent} (confidence: {confidence:.2f})")
         
         # Handle database queries if database is available
-        if db_manager.is_connected and intent in ['revenue_query', 'customer_query', 'product_query']:
+        if db_manager.is_connected and intent in AppConfig.DATABASE_INTENTS:
             db_response = self._handle_database_query(intent, user_input)
             if db_response:
-                return db_response
+                return db_response, intent, confidence
+        
+        # Database-backed intents are never cached since the underlying data can change
+        if intent in AppConfig.DATABASE_INTENTS:
+            return self._generate_for_intent(intent, confidence, user_input, context), intent, confidence
+        
+        response = self._generate_for_intent(intent, confidence, user_input, context, cache_key, embedding)
+        result = (response, intent, confidence)
+        with self._lock:
+            self._cache_response(cache_key, result)
+        return result
+    
+    def _generate_for_intent(self, intent: str, confidence: float, user_input: str,
+                             context: Optional[str] = None,
+                             cache_key: Optional[Tuple[str, str, str]] = None,
+                             embedding: Optional[np.ndarray] = None) -> str:
+        """
+        Generate a response for a recognized, non-database intent.
         
+        Args:
+            intent: Recognized intent
+            confidence: Confidence score for the intent
+            user_input: User's message
+            context: Optional context information
+            cache_key: Response cache key of the message; with embedding,
+                enables the semantic cache for generated responses
+            embedding: Normalized embedding of the message from intent recognition
+            
+        Returns:
+            Generated or fallback response string
+        """
         # Check if confidence is too low - use fallback immediately
         if confidence < AppConfig.INTENT_THRESHOLD:
             logger.info(f"Low confidence ({confidence:.2f}) < threshold ({AppConfig.INTENT_THRESHOLD}), using fallback")
@@ -313,13 +758,25 @@ class ChatbotNLP:
             return forced_fallback
         
         # Generate general response using LLM
-        if self.generator:
+        if self.model is not None:
+            # Near-duplicate messages ("Tell me a fun fact" vs "tell me a fun fact please") reuse an earlier
+            # generated answer; only checked here, where a hit saves a model call
+            use_semantic_cache = (
+                AppConfig.SEMANTIC_CACHE_SIZE > 0 and cache_key is not None and embedding is not None
+            )
+            if use_semantic_cache:
+                with self._lock:
+                    semantic_response = self._get_semantic_response(cache_key, embedding, intent)
+                if semantic_response is not None:
+                    return semantic_response
+            
             try:
                 # Prepare input with context, memory context, and Yara's personality
                 personality_instruction = "You are Yara, a friendly, enthusiastic, and helpful AI assistant. Always be warm, encouraging, and use emojis to make conversations enjoyable. Be genuinely interested in helping users and show enthusiasm for their questions."
                 
                 # Get memory context
-                memory_context = memory_manager.get_context_for_nlp()
+                with self._lock:
+                    memory_context = memory_manager.get_context_for_nlp()
                 
                 # Build full input
                 input_parts = []
@@ -333,24 +790,18 @@ class ChatbotNLP:
                 
                 full_input = "\n".join(input_parts)
                 
-                # Generate response
-                response = self.generator(
-                    full_input,
-                    max_length=len(full_input.split()) + 50,
-                    num_return_sequences=1
-                )
+                # Generate response, batched with any concurrent requests
+                generated_text = self._batcher.submit(full_input)
                 
-                if response and len(response) > 0:
-                    generated_text = response[0]['generated_text']
-                    # Extract only Yara's response
-                    if "Yara:" in generated_text:
-                        yara_response = generated_text.split("Yara:")[-1].strip()
-                    else:
-                        # Fallback to Assistant: if Yara: is not found
-                        yara_response = generated_text.split("Assistant:")[-1].strip()
+                if generated_text:
+                    # The continuation is Yara's reply up to any turn the model invents next
+                    yara_response = _NEXT_TURN_RE.split(generated_text, 1)[0].strip()
                     
                     # Validate the generated response quality
                     if self._is_valid_response(yara_response, user_input, intent):
+                        if use_semantic_cache:
+                            with self._lock:
+                                self._cache_semantic_response(cache_key, embedding, yara_response, intent)
                         return yara_response
                     else:
                         logger.info("Generated response failed quality check, using fallback")
@@ -362,6 +813,104 @@ class ChatbotNLP:
         # Fallback responses
         return self._get_fallback_response(intent, user_input)
     
+    def _generate_batch(self, prompts: List[str]) -> List[str]:
+        """Run one padded generation pass over a batch of prompts."""
+        inputs = self.tokenizer(
+            prompts,
+            return_tensors='pt',
+            padding=True,
+            truncation=True,
+            max_length=self._max_prompt_tokens
+        ).to(self.model.device)
+        # No autograd bookkeeping needed for inference
+        with torch.inference_mode():
+            outputs = self.model.generate(**inputs, **self._generation_kwargs)
+        
+        # Prompts are left-padded to the same length, so the new tokens start there
+        prompt_length = inputs['input_ids'].shape[1]
+        return self.tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
+    
+    def _response_cache_key(self, user_input: str, context: Optional[str]) -> Tuple[str, str, str]:
+        """Build a response cache key from the normalized message and conversation state."""
+        return (user_input.strip().lower(), context or "", memory_manager.get_context_for_nlp())
+    
+    def _get_cached_response(self, key: Tuple[str, str, str]) -> Optional[Tuple[str, str, float]]:
+        """Look up a cached (response, intent, confidence), refreshing its LRU position."""
+        if AppConfig.RESPONSE_CACHE_SIZE <= 0:
+            return None
+        
+        cached = self._response_cache.get(key)
+        if cached is None:
+            self.response_cache_misses += 1
+            return None
+        
+        self.response_cache_hits += 1
+        self._response_cache.move_to_end(key)
+        return cached
+    
+    def _cache_response(self, key: Tuple[str, str, str], result: Tuple[str, str, float]) -> None:
+        """Store a response in the cache, evicting the least recently used entry when full."""
+        if AppConfig.RESPONSE_CACHE_SIZE <= 0:
+            return
+        
+        self._response_cache[key] = result
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > AppConfig.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def _get_semantic_response(self, key: Tuple[str, str, str], embedding: np.ndarray,
+                               intent: str) -> Optional[str]:
+        """
+        Find a cached response to a near-duplicate of the message.
+        
+        Only entries from the same conversation state (context and memory) and
+        with the same recognized intent are considered.
+        
+        Args:
+            key: Response cache key of the new message
+            embedding: Normalized embedding of the new message
+            intent: Intent recognized for the new message
+            
+        Returns:
+            The cached response, or None if nothing is similar enough
+        """
+        candidates = [
+            (cached_key, cached_embedding, response)
+            for cached_key, (cached_embedding, response, cached_intent) in self._semantic_cache.items()
+            if cached_key[1:] == key[1:] and cached_intent == intent
+        ]
+        if not candidates:
+            return None
+        
+        # Embeddings are normalized, so the dot product is the cosine similarity
+        similarities = np.stack([candidate[1] for candidate in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < AppConfig.SEMANTIC_CACHE_THRESHOLD:
+            return None
+        
+        self.semantic_cache_hits += 1
+        self._semantic_cache.move_to_end(candidates[best][0])
+        return candidates[best][2]
+    
+    def _cache_semantic_response(self, key: Tuple[str, str, str], embedding: np.ndarray,
+                                 response: str, intent: str) -> None:
+        """Store a generated response for near-duplicate lookup, evicting the least recently used entry when full."""
+        self._semantic_cache[key] = (embedding, response, intent)
+        self._semantic_cache.move_to_end(key)
+        if len(self._semantic_cache) > AppConfig.SEMANTIC_CACHE_SIZE:
+            self._semantic_cache.popitem(last=False)
+    
+    def response_cache_info(self) -> Dict[str, int]:
+        """Get response cache statistics."""
+        return {
+            'hits': self.response_cache_hits,
+            'misses': self.response_cache_misses,
+            'size': len(self._response_cache),
+            'max_size': AppConfig.RESPONSE_CACHE_SIZE,
+            'semantic_hits': self.semantic_cache_hits,
+            'semantic_size': len(self._semantic_cache)
+        }
+    
     def _force_fallback_for_intent(self, intent: str, user_input: str) -> str:
         """
         Force fallback response for specific intents that should never use LLM generation.
@@ -390,7 +939,7 @@ class ChatbotNLP:
             return self._get_fallback_response(intent, user_input)
         
         # Force fallback for database queries when no database is available
-        if not db_manager.is_connected and intent in ['revenue_query', 'customer_query', 'product_query']:
+        if not db_manager.is_connected and intent in AppConfig.DATABASE_INTENTS:
             return self._get_fallback_response(intent, user_input)
         
         # Allow LLM generation for other intents
@@ -415,21 +964,14 @@ class ChatbotNLP:
             return False
         
         # Check for inappropriate or nonsensical responses
-        inappropriate_phrases = [
-            'waifu', 'hero that\'s needed', 'who is this', 'tell me about your',
-            'i am the', 'i am a', 'i am', 'i\'m the', 'i\'m a'
-        ]
-        
         response_lower = response.lower()
-        for phrase in inappropriate_phrases:
-            if phrase in response_lower:
-                return False
+        if _INAPPROPRIATE_PHRASES_RE.search(response_lower):
+            return False
         
         # Check if response is too generic or doesn't address the intent
         if intent == 'personal_question' and 'who are you' in user_input.lower():
             # For personal questions, ensure response is about Yara
-            personal_keywords = ['yara', 'assistant', 'ai', 'help', 'friendly', 'helpful']
-            if not any(keyword in response_lower for keyword in personal_keywords):
+            if not _PERSONAL_KEYWORDS_RE.search(response_lower):
                 return False
         
         # Check response length (not too short, not too long)
@@ -508,77 +1050,61 @@ class ChatbotNLP:
     def _format_product_response(self, data: List[Dict]) -> str:
         """Format product data into a readable response."""
         total_products = len(data)
-        categories = set(item.get('category', 'Unknown') for item in data)
+        category_count = len({item.get('category', 'Unknown') for item in data})
         return f"Fantastic! I'm excited to tell you about our product offerings! 🛍️\n\n" \
-               f"We currently offer **{total_products:,} amazing products** across **{len(categories)} different categories**! 📦\n\n" \
+               f"We currently offer **{total_products:,} amazing products** across **{category_count} different categories**! 📦\n\n" \
                f"That's quite a diverse selection! Would you like me to tell you more about any specific category or product? 😊"
     
     def _get_fallback_response(self, intent: str, user_input: str) -> str:
         """Get fallback responses when model generation fails."""
-        fallback_responses = {
-            'revenue_query': "I'm sorry, I couldn't retrieve the revenue information at the moment. Please try again later or contact our support team.",
-            'customer_query': "I'm unable to access customer data right now. Please check back later or reach out to our team for assistance.",
-            'product_query': "I'm having trouble accessing product information. Please try again later or contact our support team.",
-            'greeting': "Hi there! I'm Yara, and I'm so excited to meet you! 😊 How can I help you today?",
-            'personal_question': "I'm Yara, your friendly AI assistant! I'm here to help with conversations, answer questions, and provide insights from your data. I love being helpful and making our chats enjoyable! ✨",
-            'gratitude': "You're very welcome! I'm so glad I could help! 😊 It makes me happy when I can be useful to you.",
-            'farewell': "Goodbye! It was wonderful chatting with you! Take care and come back anytime - I'll be here ready to help! 👋✨",
-            'memory_query': "I'm not sure I understood that question. Could you rephrase it or ask me something else? 🤔",
-            'memory_store': "I'm not sure I understood that. Could you rephrase it or ask me something else? 🤔",
-            'memory_manage': "I'm not sure I understood that request. Could you rephrase it or ask me something else? 🤔",
-            'general_chat': "I'm not sure I understood that, could you rephrase? 🤔"
-        }
-        
-        # Enhanced fallback responses with more context
-        enhanced_fallbacks = {
-            'personal_question': {
-                'who are you': "I'm Yara, your friendly AI assistant! I'm here to help with conversations, answer questions, and provide insights from your data. I love being helpful and making our chats enjoyable! ✨",
-                'what\'s your name': "My name is Yara! I'm your friendly AI assistant, and I'm excited to help you with whatever you need! 😊",
-                'tell me about yourself': "I'm Yara, a friendly and enthusiastic AI assistant! I love helping people, answering questions, and making conversations enjoyable. I'm here to assist you with both general chat and data insights! ✨",
-                'what can you do': "I can help you with conversations, answer questions, provide insights from your data, and be a friendly chat companion! I'm Yara, and I'm excited to assist you! 😊"
-            }
-        }
-        
         # Check for enhanced fallbacks first
-        if intent in enhanced_fallbacks:
-            for pattern, response in enhanced_fallbacks[intent].items():
-                if pattern in user_input.lower():
+        enhanced = _ENHANCED_FALLBACKS.get(intent)
+        if enhanced:
+            user_input_lower = user_input.lower()
+            for pattern, response in enhanced:
+                if pattern in user_input_lower:
                     return response
         
-        return fallback_responses.get(intent, fallback_responses['general_chat'])
+        return _FALLBACK_RESPONSES.get(intent, _FALLBACK_RESPONSES['general_chat'])
     
     def add_to_history(self, user_input: str, response: str):
         """Add conversation to chat history."""
-        self.chat_history.append({
-            'user': user_input,
-            'assistant': response,
-            'timestamp': None  # Could add timestamp if needed
-        })
-        
-        # Limit history length
-        if len(self.chat_history) > AppConfig.MAX_HISTORY_LENGTH:
-            self.chat_history.pop(0)
+        with self._lock:
+            self.chat_history.append({
+                'user': user_input,
+                'assistant': response,
+                'timestamp': None  # Could add timestamp if needed
+            })
+            self._context_cache = None
     
     def get_context(self) -> str:
         """Get recent conversation context for better responses."""
-        if not self.chat_history:
-            return ""
-        
-        # Get last few exchanges for context
-        recent_exchanges = self.chat_history[-3:]
-        context_parts = []
-        
-        for exchange in recent_exchanges:
-            context_parts.append(f"User: {exchange['user']}")
-            context_parts.append(f"Yara: {exchange['assistant']}")
-        
-        return "\n".join(context_parts)
+        with self._lock:
+            if self._context_cache is not None:
+                return self._context_cache
+            
+            if not self.chat_history:
+                self._context_cache = ""
+                return self._context_cache
+            
+            # Get last few exchanges for context
+            recent_exchanges = islice(self.chat_history, max(0, len(self.chat_history) - 3), None)
+            context_parts = []
+            
+            for exchange in recent_exchanges:
+                context_parts.append(f"User: {exchange['user']}")
+                context_parts.append(f"Yara: {exchange['assistant']}")
+            
+            self._context_cache = "\n".join(context_parts)
+            return self._context_cache
     
     def clear_history(self):
         """Clear chat history."""
-        self.chat_history.clear()
-        # Also reset session memory when clearing history
-        memory_manager.reset_session()
+        with self._lock:
+            self.chat_history.clear()
+            self._context_cache = None
+            # Also reset session memory when clearing history
+            memory_manager.reset_session()
 
 # Global NLP instance
 nlp_engine = ChatbotNLP()
@@ -6,21 +6,26 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+import asyncio
 import logging
 import time
+from functools import lru_cache
 
-try:
+from .config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _nlp():
+    """Import the NLP engine on first use so torch/transformers stay off the startup path."""
     from .nlp import nlp_engine
+    return nlp_engine
+
+@lru_cache(maxsize=1)
+def _db():
+    """Import the database manager on first use."""
     from .db import db_manager
-    from .config import AppConfig
-except ImportError:
-    from nlp import nlp_engine
-    from db import db_manager
-    from config import AppConfig
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+    return db_manager
 
 # Pydantic models for request/response
 class ChatRequest(BaseModel):
@@ -56,21 +61,56 @@ class HealthCheck(BaseModel):
     version: str = Field(..., description="API version")
 
 # Global variables
-start_time = time.time()
+start_time = time.monotonic()  # Uptime reference; immune to wall-clock adjustments
 api_version = "1.0.0"
 
-def get_system_status() -> SystemStatus:
+# Cached table list for /database/info ("ts" of 0 means nothing cached yet)
+_table_cache: Dict[str, Any] = {"value": None, "ts": 0.0}
+_table_cache_lock: Optional[asyncio.Lock] = None
+
+async def warm_up_models(ready: asyncio.Event) -> None:
+    """
+    Load the NLP engine and database manager in a worker thread.
+    
+    Args:
+        ready: Event set once loading has finished (successfully or not)
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, _db)
+        await loop.run_in_executor(None, _nlp)
+        logger.info("Yara's models are loaded and ready to chat")
+    except Exception as e:
+        logger.error("Background model loading failed: %s", e)
+    finally:
+        ready.set()
+
+def get_system_status(nlp_ready: Optional[asyncio.Event] = None) -> SystemStatus:
     """Get current system status."""
-    current_time = time.time()
-    uptime = current_time - start_time
+    uptime = time.monotonic() - start_time
+    
+    # While warm-up is still importing and connecting in a worker thread, touching
+    # _db() or _nlp() here would block the event loop on the module import lock
+    if nlp_ready is not None and not nlp_ready.is_set():
+        return SystemStatus(
+            status="warming up",
+            assistant_name="Yara",
+            database_connected=False,
+            model_loaded=False,
+            uptime=uptime,
+            database_type=None
+        )
+    
+    db_manager = _db()
+    model_loaded = _nlp().model is not None
     
     return SystemStatus(
         status="operational",
         assistant_name="Yara",
         database_connected=db_manager.is_connected,
-        model_loaded=nlp_engine.model is not None,
+        model_loaded=model_loaded,
         uptime=uptime,
-        database_type=db_manager.engine.dialect.name if db_manager.engine else None
+        database_type=db_manager.dialect_name
     )
 
 def get_health_status() -> HealthCheck:
@@ -83,29 +123,39 @@ def get_health_status() -> HealthCheck:
     )
 
 # API endpoints
-async def chat_endpoint(request: ChatRequest) -> ChatResponse:
+async def chat_endpoint(request: ChatRequest, nlp_ready: Optional[asyncio.Event] = None) -> ChatResponse:
     """
     Main chat endpoint for processing user messages.
     
     Args:
         request: Chat request containing user message and optional context
+        nlp_ready: Optional event signalling that background model loading has finished
         
     Returns:
         ChatResponse with chatbot's response and metadata
     """
+    if nlp_ready is not None and not nlp_ready.is_set():
+        try:
+            await asyncio.wait_for(nlp_ready.wait(), timeout=AppConfig.RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Yara is still warming up, please try again shortly")
+    
     try:
-        start_time = time.time()
+        request_start = time.perf_counter_ns()
+        nlp_engine = _nlp()
+        db_manager = _db()
         
         # Get conversation context if available
         context = None
         if request.session_id:
             context = nlp_engine.get_context()
         
-        # Generate response
-        response = nlp_engine.generate_response(request.message, context)
-        
-        # Get intent information
-        intent, confidence = nlp_engine.intent_recognizer.recognize_intent(request.message)
+        # Generate response and intent information in one pass, off the event loop so
+        # concurrent requests can share a generation batch and health checks stay responsive
+        loop = asyncio.get_running_loop()
+        response, intent, confidence = await loop.run_in_executor(
+            None, nlp_engine.process, request.message, context
+        )
         
         # Add to conversation history
         nlp_engine.add_to_history(request.message, response)
@@ -113,12 +163,15 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         # Determine if database was used
         database_used = (
             db_manager.is_connected and 
-            intent in ['revenue_query', 'customer_query', 'product_query']
+            intent in AppConfig.DATABASE_INTENTS
         )
         
         # Log the interaction
-        processing_time = time.time() - start_time
-        logger.info(f"Yara processed chat in {processing_time:.2f}s - Intent: {intent} (confidence: {confidence:.2f})")
+        processing_ms = (time.perf_counter_ns() - request_start) // 1_000_000
+        logger.info(
+            "Yara processed chat in %dms - Intent: %s (confidence: %.2f)",
+            processing_ms, intent, confidence
+        )
         
         return ChatResponse(
             response=response,
@@ -131,12 +184,12 @@ async def chat_endpoint(request: ChatRequest) -> ChatResponse:
         )
         
     except Exception as e:
-        logger.error(f"Error processing chat request: {e}")
+        logger.error("Error processing chat request: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error during chat processing")
 
-async def status_endpoint() -> SystemStatus:
+async def status_endpoint(nlp_ready: Optional[asyncio.Event] = None) -> SystemStatus:
     """Get system status and health information."""
-    return get_system_status()
+    return get_system_status(nlp_ready)
 
 async def health_endpoint() -> HealthCheck:
     """Health check endpoint for monitoring."""
@@ -150,16 +203,68 @@ async def clear_history_endpoint(session_id: Optional[str] = None) -> Dict[str,
             # For now, we'll clear all history
             pass
         
-        nlp_engine.clear_history()
+        # Resolving the engine can wait on the warm-up import and clear_history
+        # waits on the NLP lock, so keep both off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: _nlp().clear_history())
         return {"message": "Chat history cleared successfully"}
         
     except Exception as e:
-        logger.error(f"Error clearing chat history: {e}")
+        logger.error("Error clearing chat history: %s", e)
         raise HTTPException(status_code=500, detail="Failed to clear chat history")
 
-async def database_info_endpoint() -> Dict[str, Any]:
+def _list_tables(db_manager) -> List[str]:
+    """Query the database for its table names via SQLAlchemy's dialect-aware inspector."""
+    from sqlalchemy import inspect
+    
+    return inspect(db_manager.engine).get_table_names()
+
+async def _get_cached_tables(db_manager) -> List[str]:
+    """
+    Get the table list, refreshing it at most once per DB_INFO_CACHE_TTL seconds.
+    
+    If a refresh fails, the last known table list is served instead (or an
+    empty list if there is none yet).
+    """
+    global _table_cache_lock
+    
+    if _table_cache["ts"] and time.monotonic() - _table_cache["ts"] < AppConfig.DB_INFO_CACHE_TTL:
+        return _table_cache["value"]
+    
+    # Created lazily so the lock belongs to the running event loop
+    if _table_cache_lock is None:
+        _table_cache_lock = asyncio.Lock()
+    
+    async with _table_cache_lock:
+        # Another request may have refreshed the cache while we were waiting
+        if _table_cache["ts"] and time.monotonic() - _table_cache["ts"] < AppConfig.DB_INFO_CACHE_TTL:
+            return _table_cache["value"]
+        
+        try:
+            loop = asyncio.get_running_loop()
+            tables = await loop.run_in_executor(None, _list_tables, db_manager)
+        except Exception as e:
+            if _table_cache["ts"]:
+                logger.warning("Could not refresh table information, serving cached list: %s", e)
+                return _table_cache["value"]
+            logger.warning("Could not retrieve table information: %s", e)
+            return []
+        
+        _table_cache["value"] = tables
+        _table_cache["ts"] = time.monotonic()
+        return tables
+
+async def database_info_endpoint(nlp_ready: Optional[asyncio.Event] = None) -> Dict[str, Any]:
     """Get database connection information and available tables."""
+    # The database manager is still being imported and connected during warm-up
+    if nlp_ready is not None and not nlp_ready.is_set():
+        return {
+            "connected": False,
+            "message": "Yara is still warming up, please try again shortly"
+        }
+    
     try:
+        db_manager = _db()
         if not db_manager.is_connected:
             return {
                 "connected": False,
@@ -167,40 +272,15 @@ async def database_info_endpoint() -> Dict[str, Any]:
             }
         
         # Get database info
-        db_info = {
-            "connected": True,
-            "type": db_manager.engine.dialect.name,
-            "host": db_manager.engine.url.host,
-            "port": db_manager.engine.url.port,
-            "database": db_manager.engine.url.database,
-            "username": db_manager.engine.url.username
-        }
+        db_info = {"connected": True, **db_manager.connection_info}
         
-        # Try to get table information
-        try:
-            with db_manager.engine.connect() as conn:
-                # Get table names (this is a simplified approach)
-                if db_manager.engine.dialect.name == 'mysql':
-                    result = conn.execute(db_manager.engine.text("SHOW TABLES"))
-                elif db_manager.engine.dialect.name == 'postgresql':
-                    result = conn.execute(db_manager.engine.text(
-                        "SELECT tablename FROM pg_tables WHERE schemaname = 'public'"
-                    ))
-                else:
-                    result = None
-                
-                if result:
-                    tables = [row[0] for row in result.fetchall()]
-                    db_info["tables"] = tables
-                    
-        except Exception as e:
-            logger.warning(f"Could not retrieve table information: {e}")
-            db_info["tables"] = []
+        # Table names come from a short-lived cache to avoid a DB round trip per call
+        db_info["tables"] = await _get_cached_tables(db_manager)
         
         return db_info
         
     except Exception as e:
-        logger.error(f"Error getting database info: {e}")
+        logger.error("Error getting database info: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve database information")
 
 # Export the endpoints for use in main.py
@@ -209,3 +289,4 @@ status_endpoint_func = status_endpoint
 health_endpoint_func = health_endpoint
 clear_history_endpoint_func = clear_history_endpoint
 database_info_endpoint_func = database_info_endpoint
+warm_up_models_func = warm_up_models
@@ -5,7 +5,6 @@ Starts a local HTTP server to serve the chatbot interface
 """
 
 import http.server
-import socketserver
 import webbrowser
 import os
 import sys
@@ -24,7 +23,8 @@ def start_server(port=8001):
     Handler = http.server.SimpleHTTPRequestHandler
     
     try:
-        with socketserver.TCPServer(("", port), Handler) as httpd:
+        # Threaded so the browser's parallel asset requests are served concurrently
+        with http.server.ThreadingHTTPServer(("", port), Handler) as httpd:
             print(f"=== Starting Yara Chatbot UI server...")
             print(f"=== Serving files from: {script_dir}")
             print(f"=== Server running at: http://localhost:{port}")
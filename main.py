@@ -10,34 +10,51 @@ Usage:
 """
 import sys
 import argparse
+import socket
 import subprocess
 import time
-import webbrowser
 from pathlib import Path
 
-# Add backend/src to Python path
-backend_src = Path(__file__).parent / 'backend' / 'src'
-sys.path.insert(0, str(backend_src))
-
 def start_backend():
     """Start the backend API server."""
     import uvicorn
-    from config import AppConfig
-    from main import app
+    from backend.src.config import AppConfig
     
     print("🚀 Starting Yara Backend API...")
     print(f"📍 API will be available at http://{AppConfig.HOST}:{AppConfig.PORT}")
     print(f"📚 API docs: http://{AppConfig.HOST}:{AppConfig.PORT}/docs")
     print()
     
+    # Reload and multiple workers both need the app as an import string
     uvicorn.run(
-        app,
+        "backend.src.main:app",
         host=AppConfig.HOST,
         port=AppConfig.PORT,
         reload=AppConfig.DEBUG,
+        workers=None if AppConfig.DEBUG else AppConfig.WORKERS,
         log_level="info"
     )
 
+def wait_for_port(port, process, timeout=15.0):
+    """
+    Wait until something is listening on localhost:port.
+    
+    Returns True as soon as a connection succeeds, or False if the process
+    exits or the timeout passes first.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        with socket.socket() as sock:
+            sock.settimeout(0.25)
+            try:
+                sock.connect(("127.0.0.1", port))
+                return True
+            except OSError:
+                time.sleep(0.05)
+    return False
+
 def start_ui(port=8001):
     """Start the frontend UI server in a separate process."""
     frontend_dir = Path(__file__).parent / 'frontend'
@@ -49,19 +66,21 @@ def start_ui(port=8001):
     
     try:
         print(f"🌐 Starting Frontend UI on port {port}...")
+        # Stays in the launcher's process group so terminal signals (Ctrl+C, and
+        # SIGHUP when the terminal closes) reach the UI even if the launcher dies
         ui_process = subprocess.Popen(
             [sys.executable, str(start_ui_script), str(port)],
             cwd=str(frontend_dir)
         )
         
-        # Wait a moment for UI server to start
-        time.sleep(2)
-        
-        if ui_process.poll() is None:
+        # Wait until the UI server accepts connections instead of sleeping blindly
+        if wait_for_port(port, ui_process):
             print(f"✅ Frontend UI started at http://localhost:{port}")
             print()
             return ui_process
         else:
+            if ui_process.poll() is None:
+                ui_process.terminate()
             print("⚠️  Frontend UI failed to start. Continuing with backend only.")
             return None
     except Exception as e:
@@ -115,13 +134,18 @@ Examples:
             print("=" * 60)
             print()
         
-        # Start backend (this will block)
+        # Start backend (this will block). uvicorn handles Ctrl+C itself and
+        # returns normally, so the UI is stopped in finally rather than only on
+        # KeyboardInterrupt
         try:
             start_backend()
         except KeyboardInterrupt:
+            pass
+        finally:
             print("\n🛑 Shutting down...")
             if ui_process:
                 ui_process.terminate()
+                ui_process.wait()
                 print("✅ Frontend UI stopped")
     else:
         print("=" * 60)